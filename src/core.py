@@ -3,12 +3,11 @@ from collections import defaultdict
 from typing import Any
 
 import cv2
-import matplotlib.pyplot as plt
 import numpy as np
 
 import src.constants as constants
 from src.logger import logger
-from src.utils.image import CLAHE_HELPER, ImageUtils
+from src.utils.image import CLAHE_HELPER, ERODE_KERNEL, ImageUtils, get_pyplot
 from src.utils.interaction import InteractionUtils
 
 
@@ -21,6 +20,12 @@ class ImageInstanceOps:
         super().__init__()
         self.tuning_config = tuning_config
         self.save_image_level = tuning_config.outputs.save_image_level
+        threshold_params = tuning_config.threshold_params
+        self.min_gap = threshold_params.MIN_GAP
+        self.min_jump = threshold_params.MIN_JUMP
+        self.confident_jump = (
+            threshold_params.MIN_JUMP + threshold_params.CONFIDENT_SURPLUS
+        )
 
     def apply_preprocessors(self, file_path, in_omr, template):
         tuning_config = self.tuning_config
@@ -39,19 +44,21 @@ class ImageInstanceOps:
     def read_omr_response(self, template, image, name, save_dir=None):
         config = self.tuning_config
         auto_align = config.alignment_params.auto_align
+        show_image_level = config.outputs.show_image_level
         try:
-            img = image.copy()
-            # origDim = img.shape[:2]
+            # origDim = image.shape[:2]
+            # Note: resize_util returns a new array, the input image is left as is
             img = ImageUtils.resize_util(
-                img, template.page_dimensions[0], template.page_dimensions[1]
+                image, template.page_dimensions[0], template.page_dimensions[1]
             )
             if img.max() > img.min():
                 img = ImageUtils.normalize_util(img)
             # Processing copies
-            transp_layer = img.copy()
+            # Note: img is never modified in place below, only final_marked is drawn on
+            transp_layer = img
             final_marked = img.copy()
 
-            morph = img.copy()
+            morph = img
             self.append_save_img(3, morph)
 
             if auto_align:
@@ -66,7 +73,7 @@ class ImageInstanceOps:
                 _, morph = cv2.threshold(morph, 220, 220, cv2.THRESH_TRUNC)
                 morph = ImageUtils.normalize_util(morph)
                 self.append_save_img(3, morph)
-                if config.outputs.show_image_level >= 4:
+                if show_image_level >= 4:
                     InteractionUtils.show("morph1", morph, 0, 1, config)
 
             # Move them to data class if needed
@@ -79,7 +86,7 @@ class ImageInstanceOps:
             # blackVals=[0]
             # whiteVals=[255]
 
-            if config.outputs.show_image_level >= 5:
+            if show_image_level >= 5:
                 all_c_box_vals = {"int": [], "mcq": []}
                 # TODO: simplify this logic
                 q_nums = {"int": [], "mcq": []}
@@ -95,7 +102,7 @@ class ImageInstanceOps:
                 _, morph_v = cv2.threshold(morph_v, 200, 200, cv2.THRESH_TRUNC)
                 morph_v = 255 - ImageUtils.normalize_util(morph_v)
 
-                if config.outputs.show_image_level >= 3:
+                if show_image_level >= 3:
                     InteractionUtils.show(
                         "morphed_vertical", morph_v, 0, 1, config=config
                     )
@@ -108,7 +115,7 @@ class ImageInstanceOps:
                 morph_thr = 60  # for Mobile images, 40 for scanned Images
                 _, morph_v = cv2.threshold(morph_v, morph_thr, 255, cv2.THRESH_BINARY)
                 # kernel best tuned to 5x5 now
-                morph_v = cv2.erode(morph_v, np.ones((5, 5), np.uint8), iterations=2)
+                morph_v = cv2.erode(morph_v, ERODE_KERNEL, iterations=2)
 
                 self.append_save_img(3, morph_v)
                 # h_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (10, 2))
@@ -118,7 +125,7 @@ class ImageInstanceOps:
                 # InteractionUtils.show("morph_h",morph_h,0,1,config=config)
                 # _, morph_h = cv2.threshold(morph_h,morph_thr,255,cv2.THRESH_BINARY)
                 # morph_h = cv2.erode(morph_h,  np.ones((5,5),np.uint8), iterations = 2)
-                if config.outputs.show_image_level >= 3:
+                if show_image_level >= 3:
                     InteractionUtils.show(
                         "morph_thr_eroded", morph_v, 0, 1, config=config
                     )
@@ -126,18 +133,18 @@ class ImageInstanceOps:
                 self.append_save_img(6, morph_v)
 
                 # template relative alignment code
+                match_col, max_steps, align_stride, thk = map(
+                    config.alignment_params.get,
+                    [
+                        "match_col",
+                        "max_steps",
+                        "stride",
+                        "thickness",
+                    ],
+                )
                 for field_block in template.field_blocks:
                     s, d = field_block.origin, field_block.dimensions
 
-                    match_col, max_steps, align_stride, thk = map(
-                        config.alignment_params.get,
-                        [
-                            "match_col",
-                            "max_steps",
-                            "stride",
-                            "thickness",
-                        ],
-                    )
                     shift, steps = 0, 0
                     while steps < max_steps:
                         left_mean = np.mean(
@@ -190,7 +197,7 @@ class ImageInstanceOps:
                 # print("End Alignment")
 
             final_align = None
-            if config.outputs.show_image_level >= 2:
+            if show_image_level >= 2:
                 initial_align = self.draw_template_layout(img, template, shifted=False)
                 final_align = self.draw_template_layout(
                     img, template, shifted=True, draw_qvals=True
@@ -257,9 +264,13 @@ class ImageInstanceOps:
             #     appendSaveImg(2,hist)
 
             per_omr_threshold_avg, total_q_strip_no, total_q_box_no = 0, 0, 0
+            text_thickness = int(1 + 3.5 * constants.TEXT_SIZE)
+            show_strip_plots = show_image_level >= 6
             for field_block in template.field_blocks:
                 block_q_strip_no = 1
                 box_w, box_h = field_block.bubble_dimensions
+                marked_inset_w, marked_inset_h = box_w / 12, box_h / 12
+                unmarked_inset_w, unmarked_inset_h = box_w / 10, box_h / 10
                 shift = field_block.shift
                 s, d = field_block.origin, field_block.dimensions
                 key = field_block.name[:3]
@@ -274,8 +285,13 @@ class ImageInstanceOps:
                         all_q_strip_arrs[total_q_strip_no],
                         global_thr,
                         no_outliers,
-                        f"Mean Intensity Histogram for {key}.{field_block_bubbles[0].field_label}.{block_q_strip_no}",
-                        config.outputs.show_image_level >= 6,
+                        # Plot titles are only needed when the plots are shown
+                        (
+                            f"Mean Intensity Histogram for {key}.{field_block_bubbles[0].field_label}.{block_q_strip_no}"
+                            if show_strip_plots
+                            else None
+                        ),
+                        show_strip_plots,
                     )
                     # print(field_block_bubbles[0].field_label,key,block_q_strip_no, "THR: ",
                     #   round(per_q_strip_threshold,2))
@@ -298,19 +314,15 @@ class ImageInstanceOps:
                             per_q_strip_threshold > all_q_vals[total_q_box_no]
                         )
                         total_q_box_no += 1
+                        x, y = bubble.x + shift, bubble.y
                         if bubble_is_marked:
                             detected_bubbles.append(bubble)
-                            x, y, field_value = (
-                                bubble.x + field_block.shift,
-                                bubble.y,
-                                bubble.field_value,
-                            )
                             cv2.rectangle(
                                 final_marked,
-                                (int(x + box_w / 12), int(y + box_h / 12)),
+                                (int(x + marked_inset_w), int(y + marked_inset_h)),
                                 (
-                                    int(x + box_w - box_w / 12),
-                                    int(y + box_h - box_h / 12),
+                                    int(x + box_w - marked_inset_w),
+                                    int(y + box_h - marked_inset_h),
                                 ),
                                 constants.CLR_DARK_GRAY,
                                 3,
@@ -318,20 +330,20 @@ class ImageInstanceOps:
 
                             cv2.putText(
                                 final_marked,
-                                str(field_value),
+                                str(bubble.field_value),
                                 (x, y),
                                 cv2.FONT_HERSHEY_SIMPLEX,
                                 constants.TEXT_SIZE,
                                 (20, 20, 10),
-                                int(1 + 3.5 * constants.TEXT_SIZE),
+                                text_thickness,
                             )
                         else:
                             cv2.rectangle(
                                 final_marked,
-                                (int(x + box_w / 10), int(y + box_h / 10)),
+                                (int(x + unmarked_inset_w), int(y + unmarked_inset_h)),
                                 (
-                                    int(x + box_w - box_w / 10),
-                                    int(y + box_h - box_h / 10),
+                                    int(x + box_w - unmarked_inset_w),
+                                    int(y + box_h - unmarked_inset_h),
                                 ),
                                 constants.CLR_GRAY,
                                 -1,
@@ -343,9 +355,11 @@ class ImageInstanceOps:
                             bubble.field_value,
                         )
                         # Only send rolls multi-marked in the directory
-                        multi_marked_local = field_label in omr_response
+                        # Note: single dict lookup, responses are never None
+                        previous_value = omr_response.get(field_label)
+                        multi_marked_local = previous_value is not None
                         omr_response[field_label] = (
-                            (omr_response[field_label] + field_value)
+                            (previous_value + field_value)
                             if multi_marked_local
                             else field_value
                         )
@@ -357,7 +371,7 @@ class ImageInstanceOps:
                         field_label = field_block_bubbles[0].field_label
                         omr_response[field_label] = field_block.empty_val
 
-                    if config.outputs.show_image_level >= 5:
+                    if show_image_level >= 5:
                         if key in all_c_box_vals:
                             q_nums[key].append(f"{key[:2]}_c{str(block_q_strip_no)}")
                             all_c_box_vals[key].append(
@@ -375,7 +389,8 @@ class ImageInstanceOps:
                 final_marked, alpha, transp_layer, 1 - alpha, 0, final_marked
             )
             # Box types
-            if config.outputs.show_image_level >= 6:
+            if show_image_level >= 6:
+                plt = get_pyplot()
                 # plt.draw()
                 f, axes = plt.subplots(len(all_c_box_vals), sharey=True)
                 f.canvas.manager.set_window_title(name)
@@ -399,7 +414,7 @@ class ImageInstanceOps:
                 plt.tight_layout(pad=0.5)
                 plt.show()
 
-            if config.outputs.show_image_level >= 3 and final_align is not None:
+            if show_image_level >= 3 and final_align is not None:
                 final_align = ImageUtils.resize_util_h(
                     final_align, int(config.dimensions.display_height)
                 )
@@ -430,7 +445,9 @@ class ImageInstanceOps:
         img = ImageUtils.resize_util(
             img, template.page_dimensions[0], template.page_dimensions[1]
         )
-        final_align = img.copy()
+        # resize_util already returns a new array, a second copy is only
+        # needed to keep reading clean bubble values for draw_qvals
+        final_align = img.copy() if draw_qvals else img
         for field_block in template.field_blocks:
             s, d = field_block.origin, field_block.dimensions
             box_w, box_h = field_block.bubble_dimensions
@@ -451,27 +468,50 @@ class ImageInstanceOps:
                     constants.CLR_BLACK,
                     3,
                 )
-            for field_block_bubbles in field_block.traverse_bubbles:
-                for pt in field_block_bubbles:
-                    x, y = (pt.x + field_block.shift, pt.y) if shifted else (pt.x, pt.y)
-                    cv2.rectangle(
-                        final_align,
-                        (int(x + box_w / 10), int(y + box_h / 10)),
-                        (int(x + box_w - box_w / 10), int(y + box_h - box_h / 10)),
-                        constants.CLR_GRAY,
-                        border,
-                    )
-                    if draw_qvals:
-                        rect = [y, y + box_h, x, x + box_w]
-                        cv2.putText(
+            if border >= 0 and not draw_qvals:
+                # All box outlines of the block in one call, same pixels as a
+                # cv2.rectangle per bubble (the int32 cast truncates like int())
+                bubble_origins = np.array(
+                    [
+                        [pt.x + shift, pt.y] if shifted else [pt.x, pt.y]
+                        for field_block_bubbles in field_block.traverse_bubbles
+                        for pt in field_block_bubbles
+                    ]
+                ).reshape(-1, 2)
+                inset_w, inset_h = box_w / 10, box_h / 10
+                xs, ys = bubble_origins[:, 0], bubble_origins[:, 1]
+                x1 = (xs + inset_w).astype(np.int32)
+                y1 = (ys + inset_h).astype(np.int32)
+                x2 = (xs + box_w - inset_w).astype(np.int32)
+                y2 = (ys + box_h - inset_h).astype(np.int32)
+                box_outlines = np.stack(
+                    [x1, y1, x2, y1, x2, y2, x1, y2], axis=-1
+                ).reshape(-1, 4, 1, 2)
+                cv2.polylines(
+                    final_align, list(box_outlines), True, constants.CLR_GRAY, border
+                )
+            else:
+                for field_block_bubbles in field_block.traverse_bubbles:
+                    for pt in field_block_bubbles:
+                        x, y = (pt.x + shift, pt.y) if shifted else (pt.x, pt.y)
+                        cv2.rectangle(
                             final_align,
-                            f"{int(cv2.mean(img[rect[0] : rect[1], rect[2] : rect[3]])[0])}",
-                            (rect[2] + 2, rect[0] + (box_h * 2) // 3),
-                            cv2.FONT_HERSHEY_SIMPLEX,
-                            0.6,
-                            constants.CLR_BLACK,
-                            2,
+                            (int(x + box_w / 10), int(y + box_h / 10)),
+                            (int(x + box_w - box_w / 10), int(y + box_h - box_h / 10)),
+                            constants.CLR_GRAY,
+                            border,
                         )
+                        if draw_qvals:
+                            rect = [y, y + box_h, x, x + box_w]
+                            cv2.putText(
+                                final_align,
+                                f"{int(cv2.mean(img[rect[0] : rect[1], rect[2] : rect[3]])[0])}",
+                                (rect[2] + 2, rect[0] + (box_h * 2) // 3),
+                                cv2.FONT_HERSHEY_SIMPLEX,
+                                0.6,
+                                constants.CLR_BLACK,
+                                2,
+                            )
             if shifted:
                 text_in_px = cv2.getTextSize(
                     field_block.name, cv2.FONT_HERSHEY_SIMPLEX, constants.TEXT_SIZE, 4
@@ -541,25 +581,27 @@ class ImageInstanceOps:
         q_vals = sorted(q_vals_orig)
         # Find the FIRST LARGE GAP and set it as threshold:
         ls = (looseness + 1) // 2
-        l = len(q_vals) - ls
+        # jumps[j] is the jump around position j + ls, for all positions at once
+        q_vals_arr = np.asarray(q_vals, dtype=np.float64)
+        jumps = q_vals_arr[2 * ls :] - q_vals_arr[: max(len(q_vals_arr) - 2 * ls, 0)]
+        new_thrs = q_vals_arr[: len(jumps)] + jumps / 2
         max1, thr1 = MIN_JUMP, global_default_threshold
-        for i in range(ls, l):
-            jump = q_vals[i + ls] - q_vals[i - ls]
-            if jump > max1:
-                max1 = jump
-                thr1 = q_vals[i - ls] + jump / 2
+        if len(jumps) > 0:
+            # argmax picks the first of equal maxima, same as a strict > scan
+            i = int(np.argmax(jumps))
+            if jumps[i] > max1:
+                max1, thr1 = float(jumps[i]), float(new_thrs[i])
 
         # NOTE: thr2 is deprecated, thus is JUMP_DELTA
         # Make use of the fact that the JUMP_DELTA(Vertical gap ofc) between
         # values at detected jumps would be atleast 20
         max2, thr2 = MIN_JUMP, global_default_threshold
         # Requires atleast 1 gray box to be present (Roll field will ensure this)
-        for i in range(ls, l):
-            jump = q_vals[i + ls] - q_vals[i - ls]
-            new_thr = q_vals[i - ls] + jump / 2
-            if jump > max2 and abs(thr1 - new_thr) > JUMP_DELTA:
-                max2 = jump
-                thr2 = new_thr
+        far_jumps = np.where(np.abs(thr1 - new_thrs) > JUMP_DELTA, jumps, -np.inf)
+        if len(far_jumps) > 0:
+            i = int(np.argmax(far_jumps))
+            if far_jumps[i] > max2:
+                max2, thr2 = float(far_jumps[i]), float(new_thrs[i])
         # global_thr = min(thr1,thr2)
         global_thr, j_low, j_high = thr1, thr1 - max1 // 2, thr1 + max1 // 2
 
@@ -570,6 +612,7 @@ class ImageInstanceOps:
         #     global_thr, j_low, j_high = thr2, thr2 - max2//2, thr2 + max2//2
 
         if plot_title:
+            plt = get_pyplot()
             _, ax = plt.subplots()
             ax.bar(range(len(q_vals_orig)), q_vals if sort_in_plot else q_vals_orig)
             ax.set_title(plot_title)
@@ -617,7 +660,6 @@ class ImageInstanceOps:
             ||||||||||
 
         """
-        config = self.tuning_config
         # Sort the Q bubbleValues
         q_vals = sorted(q_vals)
 
@@ -626,7 +668,7 @@ class ImageInstanceOps:
         if len(q_vals) < 3:
             thr1 = (
                 global_thr
-                if np.max(q_vals) - np.min(q_vals) < config.threshold_params.MIN_GAP
+                if np.max(q_vals) - np.min(q_vals) < self.min_gap
                 else np.mean(q_vals)
             )
         else:
@@ -648,21 +690,17 @@ class ImageInstanceOps:
 
             # else:
             # Find the LARGEST GAP and set it as threshold: //(FIRST LARGE GAP)
-            l = len(q_vals) - 1
-            max1, thr1 = config.threshold_params.MIN_JUMP, 255
-            for i in range(1, l):
-                jump = q_vals[i + 1] - q_vals[i - 1]
-                if jump > max1:
-                    max1 = jump
-                    thr1 = q_vals[i - 1] + jump / 2
+            q_vals_arr = np.asarray(q_vals, dtype=np.float64)
+            jumps = q_vals_arr[2:] - q_vals_arr[:-2]
+            max1, thr1 = self.min_jump, 255
+            i = int(np.argmax(jumps))
+            if jumps[i] > max1:
+                max1 = float(jumps[i])
+                thr1 = float(q_vals_arr[i] + jumps[i] / 2)
             # print(field_label,q_vals,max1)
 
-            confident_jump = (
-                config.threshold_params.MIN_JUMP
-                + config.threshold_params.CONFIDENT_SURPLUS
-            )
             # If not confident, then only take help of global_thr
-            if max1 < confident_jump:
+            if max1 < self.confident_jump:
                 if no_outliers:
                     # All Black or All White case
                     thr1 = global_thr
@@ -675,6 +713,7 @@ class ImageInstanceOps:
 
         # Make a common plot function to show local and global thresholds
         if plot_show and plot_title is not None:
+            plt = get_pyplot()
             _, ax = plt.subplots()
             ax.bar(range(len(q_vals)), q_vals)
             thrline = ax.axhline(thr1, color="green", ls=("-."), linewidth=3)
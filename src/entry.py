@@ -7,12 +7,10 @@
 
 """
 import os
-from csv import QUOTE_NONNUMERIC
 from pathlib import Path
 from time import time
 
 import cv2
-import pandas as pd
 from rich.table import Table
 
 from src import constants
@@ -20,7 +18,12 @@ from src.defaults import CONFIG_DEFAULTS
 from src.evaluation import EvaluationConfig, evaluate_concatenated_response
 from src.logger import console, logger
 from src.template import Template
-from src.utils.file import Paths, setup_dirs_for_paths, setup_outputs_for_template
+from src.utils.file import (
+    Paths,
+    append_csv_row,
+    setup_dirs_for_paths,
+    setup_outputs_for_template,
+)
 from src.utils.image import ImageUtils
 from src.utils.interaction import InteractionUtils, Stats
 from src.utils.parsing import get_concatenated_response, open_config_with_defaults
@@ -103,10 +106,10 @@ def process_dir(
     omr_files = sorted([f for ext in exts for f in curr_dir.glob(ext)])
 
     # Exclude images (take union over all pre_processors)
-    excluded_files = []
+    excluded_files = set()
     if template:
         for pp in template.pre_processors:
-            excluded_files.extend(Path(p) for p in pp.exclude_files())
+            excluded_files.update(Path(p) for p in pp.exclude_files())
 
     local_evaluation_path = curr_dir.joinpath(constants.EVALUATION_FILENAME)
     if not args["setLayout"] and os.path.exists(local_evaluation_path):
@@ -121,11 +124,12 @@ def process_dir(
             tuning_config,
         )
 
-        excluded_files.extend(
+        excluded_files.update(
             Path(exclude_file) for exclude_file in evaluation_config.get_exclude_files()
         )
 
-    omr_files = [f for f in omr_files if f not in excluded_files]
+    if excluded_files:
+        omr_files = [f for f in omr_files if f not in excluded_files]
 
     if omr_files:
         if not template:
@@ -206,6 +210,8 @@ def process_files(
     start_time = int(time())
     files_counter = 0
     STATS.files_not_moved = 0
+    paths = outputs_namespace.paths
+    save_dir = paths.save_marked_dir
 
     for file_path in omr_files:
         files_counter += 1
@@ -228,7 +234,7 @@ def process_files(
 
         if in_omr is None:
             # Error OMR case
-            new_file_path = outputs_namespace.paths.errors_dir.joinpath(file_name)
+            new_file_path = paths.errors_dir.joinpath(file_name)
             outputs_namespace.OUTPUT_SET.append(
                 [file_name] + outputs_namespace.empty_resp
             )
@@ -241,18 +247,11 @@ def process_files(
                     new_file_path,
                     "NA",
                 ] + outputs_namespace.empty_resp
-                pd.DataFrame(err_line, dtype=str).T.to_csv(
-                    outputs_namespace.files_obj["Errors"],
-                    mode="a",
-                    quoting=QUOTE_NONNUMERIC,
-                    header=False,
-                    index=False,
-                )
+                append_csv_row(outputs_namespace.files_obj["Errors"], err_line)
             continue
 
         # uniquify
         file_id = str(file_name)
-        save_dir = outputs_namespace.paths.save_marked_dir
         (
             response_dict,
             final_marked,
@@ -275,7 +274,7 @@ def process_files(
         score = 0
         if evaluation_config is not None:
             score = evaluate_concatenated_response(
-                omr_response, evaluation_config, file_path, outputs_namespace.paths.evaluation_dir
+                omr_response, evaluation_config, file_path, paths.evaluation_dir
             )
             logger.info(
                 f"(/{files_counter}) Graded with score: {round(score, 2)}\t for file: '{file_id}'"
@@ -306,28 +305,16 @@ def process_files(
             # Enter into Results sheet-
             results_line = [file_name, file_path, new_file_path, score] + resp_array
             # Write/Append to results_line file(opened in append mode)
-            pd.DataFrame(results_line, dtype=str).T.to_csv(
-                outputs_namespace.files_obj["Results"],
-                mode="a",
-                quoting=QUOTE_NONNUMERIC,
-                header=False,
-                index=False,
-            )
+            append_csv_row(outputs_namespace.files_obj["Results"], results_line)
         else:
             # multi_marked file
             logger.info(f"[{files_counter}] Found multi-marked file: '{file_id}'")
-            new_file_path = outputs_namespace.paths.multi_marked_dir.joinpath(file_name)
+            new_file_path = paths.multi_marked_dir.joinpath(file_name)
             if check_and_move(
                 constants.ERROR_CODES.MULTI_BUBBLE_WARN, file_path, new_file_path
             ):
                 mm_line = [file_name, file_path, new_file_path, "NA"] + resp_array
-                pd.DataFrame(mm_line, dtype=str).T.to_csv(
-                    outputs_namespace.files_obj["MultiMarked"],
-                    mode="a",
-                    quoting=QUOTE_NONNUMERIC,
-                    header=False,
-                    index=False,
-                )
+                append_csv_row(outputs_namespace.files_obj["MultiMarked"], mm_line)
             # else:
             #     TODO:  Add appropriate record handling here
             #     pass
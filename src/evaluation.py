@@ -91,6 +91,9 @@ class AnswerMatcher:
                 self.marking[f"correct-{allowed_answer}"] = parse_float_or_fraction(
                     answer_score
                 )
+            self.weighted_allowed_answers = [
+                allowed_answer for allowed_answer, _answer_score in answer_item
+            ]
 
     def get_marking_scheme(self):
         return self.section_marking_scheme
@@ -132,9 +135,7 @@ class AnswerMatcher:
             return "incorrect"
 
     def get_multiple_correct_weighted_verdict(self, marked_answer):
-        allowed_answers = [
-            allowed_answer for allowed_answer, _answer_score in self.answer_item
-        ]
+        allowed_answers = self.weighted_allowed_answers
         if marked_answer == self.empty_val:
             return "unmarked"
         elif marked_answer in allowed_answers:
@@ -254,7 +255,7 @@ class EvaluationConfig:
                 omr_response = get_concatenated_response(response_dict, template)
 
                 empty_val = template.global_empty_val
-                empty_answer_regex = (
+                empty_answer_pattern = re.compile(
                     rf"{re.escape(empty_val)}+" if empty_val != "" else r"^$"
                 )
 
@@ -265,7 +266,7 @@ class EvaluationConfig:
                     empty_answered_questions = [
                         question
                         for question in self.questions_in_order
-                        if re.search(empty_answer_regex, omr_response[question])
+                        if empty_answer_pattern.search(omr_response[question])
                     ]
                     if len(empty_answered_questions) > 0:
                         logger.error(
@@ -281,7 +282,7 @@ class EvaluationConfig:
                     self.questions_in_order = sorted(
                         question
                         for (question, answer) in omr_response.items()
-                        if not re.search(empty_answer_regex, answer)
+                        if not empty_answer_pattern.search(answer)
                     )
                 answers_in_order = [
                     omr_response[question] for question in self.questions_in_order
@@ -294,6 +295,7 @@ class EvaluationConfig:
             answers_in_order = options["answers_in_order"]
 
         self.validate_questions(answers_in_order)
+        self.all_questions = set(self.questions_in_order)
 
         self.section_marking_schemes, self.question_to_scheme = {}, {}
         for section_key, section_scheme in marking_schemes.items():
@@ -324,7 +326,7 @@ class EvaluationConfig:
         self.reset_explanation_table()
 
         omr_response_questions = set(omr_response.keys())
-        all_questions = set(self.questions_in_order)
+        all_questions = self.all_questions
         missing_questions = sorted(all_questions.difference(omr_response_questions))
         if len(missing_questions) > 0:
             logger.critical(f"Missing OMR response for: {missing_questions}")
@@ -449,8 +451,7 @@ class EvaluationConfig:
                 )
             section_questions = section_questions.union(current_set)
 
-        all_questions = set(self.questions_in_order)
-        missing_questions = sorted(section_questions.difference(all_questions))
+        missing_questions = sorted(section_questions.difference(self.all_questions))
         if len(missing_questions) > 0:
             logger.critical(f"Missing answer key for: {missing_questions}")
             raise Exception(
@@ -5,7 +5,7 @@ import numpy as np
 
 from src.logger import logger
 from src.processors.interfaces.ImagePreprocessor import ImagePreprocessor
-from src.utils.image import ImageUtils
+from src.utils.image import ERODE_KERNEL, ImageUtils
 from src.utils.interaction import InteractionUtils
 
 
@@ -29,6 +29,7 @@ class CropOnMarkers(ImagePreprocessor):
         self.marker_rescale_steps = int(marker_ops.get("marker_rescale_steps", 10))
         self.apply_erode_subtract = marker_ops.get("apply_erode_subtract", True)
         self.marker = self.load_marker(marker_ops, config)
+        self.rescaled_markers = self.generate_rescaled_markers()
 
     def __str__(self):
         return self.marker_path
@@ -42,7 +43,7 @@ class CropOnMarkers(ImagePreprocessor):
         image_eroded_sub = ImageUtils.normalize_util(
             image
             if self.apply_erode_subtract
-            else (image - cv2.erode(image, kernel=np.ones((5, 5)), iterations=5))
+            else (image - cv2.erode(image, kernel=ERODE_KERNEL, iterations=5))
         )
         # Quads on warped image
         quads = {}
@@ -64,17 +65,17 @@ class CropOnMarkers(ImagePreprocessor):
                 InteractionUtils.show("Quads", image_eroded_sub, config=config)
             return None
 
-        optimal_marker = ImageUtils.resize_util_h(
-            self.marker, u_height=int(self.marker.shape[0] * best_scale)
-        )
+        # Reuse the marker already rescaled to best_scale
+        optimal_marker = self.rescaled_markers[best_scale]
         _h, w = optimal_marker.shape[:2]
         centres = []
         sum_t, max_t = 0, 0
-        quarter_match_log = "Matching Marker:  "
+        quarter_match_logs = []
         for k in range(0, 4):
             res = cv2.matchTemplate(quads[k], optimal_marker, cv2.TM_CCOEFF_NORMED)
-            max_t = res.max()
-            quarter_match_log += f"Quarter{str(k + 1)}: {str(round(max_t, 3))}\t"
+            # Single pass for both the best score and its (first) location
+            _, max_t, _, max_loc = cv2.minMaxLoc(res)
+            quarter_match_logs.append(f"Quarter{str(k + 1)}: {str(round(max_t, 3))}\t")
             if (
                 max_t < self.min_matching_threshold
                 or abs(all_max_t - max_t) >= self.max_matching_variation
@@ -107,8 +108,7 @@ class CropOnMarkers(ImagePreprocessor):
                     )
                 return None
 
-            pt = np.argwhere(res == max_t)[0]
-            pt = [pt[1], pt[0]]
+            pt = list(max_loc)
             pt[0] += origins[k][0]
             pt[1] += origins[k][1]
             # print(">>",pt)
@@ -126,7 +126,7 @@ class CropOnMarkers(ImagePreprocessor):
             centres.append([pt[0] + w / 2, pt[1] + _h / 2])
             sum_t += max_t
 
-        logger.info(quarter_match_log)
+        logger.info("Matching Marker:  " + "".join(quarter_match_logs))
         logger.info(f"Optimal Scale: {best_scale}")
         # analysis data
         self.threshold_circles.append(sum_t / 4)
@@ -183,20 +183,17 @@ class CropOnMarkers(ImagePreprocessor):
         )
 
         if self.apply_erode_subtract:
-            marker -= cv2.erode(marker, kernel=np.ones((5, 5)), iterations=5)
+            marker -= cv2.erode(marker, kernel=ERODE_KERNEL, iterations=5)
 
         return marker
 
-    # Resizing the marker within scaleRange at rate of descent_per_step to
-    # find the best match.
-    def getBestMatch(self, image_eroded_sub):
-        config = self.tuning_config
+    # Resizing the marker within scaleRange at rate of descent_per_step.
+    def generate_rescaled_markers(self):
         descent_per_step = (
             self.marker_rescale_range[1] - self.marker_rescale_range[0]
         ) // self.marker_rescale_steps
         _h, _w = self.marker.shape[:2]
-        res, best_scale = None, None
-        all_max_t = 0
+        rescaled_markers = {}
 
         for r0 in np.arange(
             self.marker_rescale_range[1],
@@ -209,12 +206,23 @@ class CropOnMarkers(ImagePreprocessor):
             rescaled_marker = ImageUtils.resize_util_h(
                 self.marker, u_height=int(_h * s)
             )
+            rescaled_markers[s] = rescaled_marker
+
+        return rescaled_markers
+
+    # Match the pre-computed rescaled markers to find the best match.
+    def getBestMatch(self, image_eroded_sub):
+        config = self.tuning_config
+        res, best_scale = None, None
+        all_max_t = 0
+
+        for s, rescaled_marker in self.rescaled_markers.items():
             # res is the black image with white dots
             res = cv2.matchTemplate(
                 image_eroded_sub, rescaled_marker, cv2.TM_CCOEFF_NORMED
             )
 
-            max_t = res.max()
+            _, max_t, _, _ = cv2.minMaxLoc(res)
             if all_max_t < max_t:
                 # print('Scale: '+str(s)+', Circle Match: '+str(round(max_t*100,2))+'%')
                 best_scale, all_max_t = s, max_t
@@ -33,6 +33,9 @@ class FeatureBasedAlignment(ImagePreprocessor):
         self.to_keypoints, self.to_descriptors = self.orb.detectAndCompute(
             self.ref_img, None
         )
+        self.matcher = cv2.DescriptorMatcher_create(
+            cv2.DESCRIPTOR_MATCHER_BRUTEFORCE_HAMMING
+        )
 
     def __str__(self):
         return self.ref_path.name
@@ -52,14 +55,11 @@ class FeatureBasedAlignment(ImagePreprocessor):
         from_keypoints, from_descriptors = self.orb.detectAndCompute(image, None)
 
         # Match features.
-        matcher = cv2.DescriptorMatcher_create(
-            cv2.DESCRIPTOR_MATCHER_BRUTEFORCE_HAMMING
-        )
-
         # create BFMatcher object (alternate matcher)
         # matcher = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
 
-        matches = np.array(matcher.match(from_descriptors, self.to_descriptors, None))
+        # Note: sorted() below builds its own list, no need for an extra array copy
+        matches = self.matcher.match(from_descriptors, self.to_descriptors, None)
 
         # Sort matches by score
         matches = sorted(matches, key=lambda x: x.distance, reverse=False)
@@ -76,12 +76,13 @@ class FeatureBasedAlignment(ImagePreprocessor):
             InteractionUtils.show("Aligning", im_matches, resize=True, config=config)
 
         # Extract location of good matches
-        points1 = np.zeros((len(matches), 2), dtype=np.float32)
-        points2 = np.zeros((len(matches), 2), dtype=np.float32)
-
-        for i, match in enumerate(matches):
-            points1[i, :] = from_keypoints[match.queryIdx].pt
-            points2[i, :] = self.to_keypoints[match.trainIdx].pt
+        points1 = np.array(
+            [from_keypoints[match.queryIdx].pt for match in matches], dtype=np.float32
+        ).reshape(-1, 2)
+        points2 = np.array(
+            [self.to_keypoints[match.trainIdx].pt for match in matches],
+            dtype=np.float32,
+        ).reshape(-1, 2)
 
         # Find homography
         height, width = self.ref_img.shape
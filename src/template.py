@@ -316,6 +316,8 @@ class Bubble:
     It can also correspond to a single digit of integer type Q (eg q5d1)
     """
 
+    __slots__ = ("x", "y", "field_label", "field_type", "field_value")
+
     def __init__(self, pt, field_label, field_type, field_value):
         self.x = round(pt[0])
         self.y = round(pt[1])
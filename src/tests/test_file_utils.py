@@ -0,0 +1,43 @@
+from csv import QUOTE_NONNUMERIC
+from pathlib import Path
+
+import pandas as pd
+
+from src.utils.file import append_csv_row
+
+ROWS = [
+    ["file_id", "input_path", "output_path", "score", "q1", "q2"],
+    ["a.jpg", Path("in/a.jpg"), Path("out/a.jpg"), 2.5, "AB", ""],
+    ['say "hi", there', "in/b.jpg", "out/b.jpg", 0, "1", "NA"],
+]
+
+
+def write_with_pandas(path):
+    for row in ROWS:
+        pd.DataFrame(row, dtype=str).T.to_csv(
+            path,
+            mode="a",
+            quoting=QUOTE_NONNUMERIC,
+            header=False,
+            index=False,
+        )
+
+
+def test_append_csv_row_matches_pandas(tmp_path):
+    expected_path = str(tmp_path.joinpath("expected.csv"))
+    write_with_pandas(expected_path)
+
+    by_path = str(tmp_path.joinpath("by_path.csv"))
+    for row in ROWS:
+        append_csv_row(by_path, row)
+
+    by_handle = tmp_path.joinpath("by_handle.csv")
+    with open(by_handle, "a") as f:
+        for row in ROWS:
+            append_csv_row(f, row)
+
+    with open(expected_path, "rb") as f:
+        expected = f.read()
+    for path in [by_path, by_handle]:
+        with open(path, "rb") as f:
+            assert f.read() == expected
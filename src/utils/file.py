@@ -1,24 +1,47 @@
 import argparse
+import csv
 import json
 import os
 from csv import QUOTE_NONNUMERIC
 from time import localtime, strftime
 
-import pandas as pd
-
 from src.logger import logger
 
+try:
+    # Prefer the faster orjson parser when available
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def load_json(path, **rest):
     try:
-        with open(path, "r") as f:
-            loaded = json.load(f, **rest)
+        if orjson is not None and not rest:
+            with open(path, "rb") as f:
+                loaded = orjson.loads(f.read())
+        else:
+            with open(path, "r") as f:
+                loaded = json.load(f, **rest)
+    # Note: orjson.JSONDecodeError is a subclass of json.JSONDecodeError
     except json.decoder.JSONDecodeError as error:
         logger.critical(f"Error when loading json file at: '{path}'\n{error}")
         exit(1)
     return loaded
 
 
+def append_csv_row(target, row):
+    """Appends one row of string values to a sheet given as a path or an open file.
+
+    Quoting and line endings are the same as pandas' to_csv with QUOTE_NONNUMERIC.
+    """
+    if isinstance(target, str):
+        with open(target, "a", newline="", encoding="utf-8") as f:
+            append_csv_row(f, row)
+        return
+    writer = csv.writer(target, quoting=QUOTE_NONNUMERIC, lineterminator=os.linesep)
+    writer.writerow([str(value) for value in row])
+
+
 class Paths:
     def __init__(self, output_dir):
         self.output_dir = output_dir
@@ -78,16 +101,9 @@ def setup_outputs_for_template(paths, template):
     for file_key, file_name in ns.filesMap.items():
         if not os.path.exists(file_name):
             logger.info(f"Created new file: '{file_name}'")
-            # moved handling of files to pandas csv writer
             ns.files_obj[file_key] = file_name
             # Create Header Columns
-            pd.DataFrame([ns.sheetCols], dtype=str).to_csv(
-                ns.files_obj[file_key],
-                mode="a",
-                quoting=QUOTE_NONNUMERIC,
-                header=False,
-                index=False,
-            )
+            append_csv_row(ns.files_obj[file_key], ns.sheetCols)
         else:
             logger.info(f"Present : appending to '{file_name}'")
             ns.files_obj[file_key] = open(file_name, "a")
@@ -6,14 +6,24 @@
  Github: https://github.com/Udayraj123
 
 """
+from functools import lru_cache
+
 import cv2
-import matplotlib.pyplot as plt
 import numpy as np
 
 from src.logger import logger
 
-plt.rcParams["figure.figsize"] = (10.0, 8.0)
 CLAHE_HELPER = cv2.createCLAHE(clipLimit=5.0, tileGridSize=(8, 8))
+ERODE_KERNEL = np.ones((5, 5), np.uint8)
+
+
+@lru_cache(maxsize=1)
+def get_pyplot():
+    # matplotlib is slow to import and only needed for the debug plots
+    import matplotlib.pyplot as plt
+
+    plt.rcParams["figure.figsize"] = (10.0, 8.0)
+    return plt
 
 
 class ImageUtils:
@@ -86,13 +96,19 @@ class ImageUtils:
         return edged
 
     @staticmethod
-    def adjust_gamma(image, gamma=1.0):
+    @lru_cache(maxsize=32)
+    def get_gamma_table(gamma):
         # build a lookup table mapping the pixel values [0, 255] to
         # their adjusted gamma values
         inv_gamma = 1.0 / gamma
-        table = np.array(
-            [((i / 255.0) ** inv_gamma) * 255 for i in np.arange(0, 256)]
-        ).astype("uint8")
+        table = (((np.arange(0, 256) / 255.0) ** inv_gamma) * 255).astype("uint8")
+        # The table is shared between calls, guard it against edits
+        table.flags.writeable = False
+        return table
+
+    @staticmethod
+    def adjust_gamma(image, gamma=1.0):
+        table = ImageUtils.get_gamma_table(gamma)
 
         # apply gamma correction using the lookup table
         return cv2.LUT(image, table)
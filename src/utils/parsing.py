@@ -31,14 +31,16 @@ OVERRIDE_MERGER = Merger(
     ["override"],
 )
 
+FIELD_STRING_PATTERN = re.compile(FIELD_STRING_REGEX_GROUPS)
+FIELD_LABEL_NUMBER_PATTERN = re.compile(FIELD_LABEL_NUMBER_REGEX)
+
 
 def get_concatenated_response(omr_response, template):
     # Multi-column/multi-row questions which need to be concatenated
-    concatenated_response = {}
-    for field_label, concatenate_keys in template.custom_labels.items():
-        custom_label = "".join([omr_response[k] for k in concatenate_keys])
-        concatenated_response[field_label] = custom_label
-
+    concatenated_response = {
+        field_label: "".join([omr_response[k] for k in concatenate_keys])
+        for field_label, concatenate_keys in template.custom_labels.items()
+    }
     for field_label in template.non_custom_labels:
         concatenated_response[field_label] = omr_response[field_label]
 
@@ -85,9 +87,7 @@ def parse_fields(key, fields):
 
 def parse_field_string(field_string):
     if "." in field_string:
-        field_prefix, start, end = re.findall(FIELD_STRING_REGEX_GROUPS, field_string)[
-            0
-        ]
+        field_prefix, start, end = FIELD_STRING_PATTERN.findall(field_string)[0]
         start, end = int(start), int(end)
         if start >= end:
             raise Exception(
@@ -101,7 +101,7 @@ def parse_field_string(field_string):
 
 
 def custom_sort_output_columns(field_label):
-    label_prefix, label_suffix = re.findall(FIELD_LABEL_NUMBER_REGEX, field_label)[0]
+    label_prefix, label_suffix = FIELD_LABEL_NUMBER_PATTERN.findall(field_label)[0]
     return [label_prefix, int(label_suffix) if len(label_suffix) > 0 else 0]
 
 